@@ -31,34 +31,301 @@ Overlays (each frame)
 
 Dependencies
 ------------
-    pip install djitellopy ultralytics opencv-python keyboard torch
+    pip install djitellopy ultralytics opencv-python keyboard torch tensorrt av
 """
 
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+import threading
 import time
+import av
 import cv2
 import keyboard
+import numpy as np
 import torch
+import torch.nn.functional as F
 from ultralytics import YOLO
+from ultralytics.nn.autobackend import AutoBackend
+from ultralytics.utils import ops
 from djitellopy import Tello
 
 # --------------------------------------------------------------------------- #
 # 1.  Model‑loader                                                            #
 # --------------------------------------------------------------------------- #
 
-def load_detector(model_path: str = "yolov8n.pt", imgsz: int = 416, prefer_gpu: bool = True) -> YOLO:
-    """Return a ready‑to‑run YOLOv8 detector on CPU or GPU."""
-    model = YOLO(model_path)
-    model.to("cuda" if prefer_gpu and torch.cuda.is_available() else "cpu")
-    model.fuse()
+def export_engine(model_path: str = "yolov8n.pt", imgsz: int = 416, precision: str = "int8") -> str:
+    """Export *model_path* once to a TensorRT engine and return its path.
+
+    ``precision`` is ``"fp16"`` or ``"int8"``; INT8 engines are calibrated on
+    COCO and carry their calibration cache alongside the engine file.
+    """
+    if precision not in ("fp16", "int8"):
+        raise ValueError(f"Unsupported TensorRT precision: {precision}")
+    engine_path = Path(model_path).with_name(f"{Path(model_path).stem}-{precision}.engine")
+    if not engine_path.exists():
+        opts = {"int8": True, "data": "coco.yaml"} if precision == "int8" else {"half": True}
+        exported = YOLO(model_path).export(format="engine", imgsz=imgsz, device=0, **opts)
+        # Ultralytics always writes <stem>.engine; keep one file per precision
+        Path(exported).replace(engine_path)
+    return str(engine_path)
+
+
+def load_detector(model_path: str = "yolov8n.pt",
+                  imgsz: int = 416,
+                  prefer_gpu: bool = True,
+                  precision: str = "int8") -> AutoBackend:
+    """Return a ready‑to‑run YOLOv8 detector on CPU or GPU.
+
+    On CUDA the PyTorch weights are swapped for a TensorRT engine in the
+    requested ``precision`` ("fp16" / "int8", exported on first use); pass
+    ``"fp32"`` to keep the PyTorch runtime. ``.engine`` paths are loaded as‑is.
+
+    The detector is Ultralytics' ``AutoBackend``: calling it returns the raw
+    head output, so NMS runs on the device without ``Results`` objects (whose
+    construction copies the whole input batch back to the host).
+    """
+    use_gpu = prefer_gpu and torch.cuda.is_available()
+    if use_gpu and precision != "fp32" and model_path.endswith(".pt"):
+        model_path = export_engine(model_path, imgsz, precision)
+    # .pt weights are fused on load; TensorRT engines pick their own precision
+    model = AutoBackend(model_path, device=torch.device("cuda" if use_gpu else "cpu"),
+                        fp16=False, fuse=True, verbose=False)
+    model.eval()
+    model.warmup(imgsz=(1, 3, imgsz, imgsz))
     model.imgsz = imgsz
     return model
 
 # --------------------------------------------------------------------------- #
-# 2.  Main flight loop                                                        #
+# 2.  GPU preprocessing                                                       #
 # --------------------------------------------------------------------------- #
 
-def run_drone(detector: YOLO,
+class GpuPreprocessor:
+    """Letterbox + BGR→RGB + HWC→CHW + /255 of a Tello frame, done on the GPU.
+
+    The raw ``uint8`` frame is staged in a pinned host buffer so the upload is
+    asynchronous, and the detector receives a ready ``1×3×imgsz×imgsz`` tensor,
+    which skips Ultralytics' CPU letterbox.  Boxes predicted on that tensor are
+    mapped back to frame pixels with :meth:`unletterbox`.
+
+    Buffers come in ``slots`` (ping‑pong), each with its own CUDA stream, so a
+    frame can be prepared while the previous one is still being inferred.
+    On CUDA the fixed‑shape kernel sequence of every slot is recorded as a
+    CUDA Graph when the buffers are allocated and replayed per frame to cut
+    launch overhead and jitter.  Allocation (the first frame, or a new frame size) frees the
+    buffers and recaptures, so it must not overlap an inference still reading
+    them.
+    """
+
+    def __init__(self, imgsz: int = 416, device: str = "cuda", slots: int = 2):
+        self.imgsz = imgsz
+        self.device = torch.device(device)
+        self.dtype = torch.float16 if self.device.type == "cuda" else torch.float32
+        self.slots = slots
+        self.streams = [torch.cuda.Stream(self.device) if self.device.type == "cuda" else None
+                        for _ in range(slots)]
+        self.graphs = [None] * slots
+        self.frame_shape = None
+        self.scale, self.pad = 1.0, (0, 0)
+
+    def _allocate(self, frame_shape):
+        """(Re)allocate the staging buffers and letterbox geometry for a frame size."""
+        h, w = frame_shape[:2]
+        pin = self.device.type == "cuda"
+        self.frame_shape = frame_shape
+        self.scale = min(self.imgsz / h, self.imgsz / w)
+        nh, nw = round(h * self.scale), round(w * self.scale)
+        top, left = (self.imgsz - nh) // 2, (self.imgsz - nw) // 2
+        self.resized = (nh, nw)
+        self.pad = (left, top)
+        self.host, self.dev, self.out, self.roi = [], [], [], []
+        for _ in range(self.slots):
+            out = torch.full((1, 3, self.imgsz, self.imgsz), 114 / 255, dtype=self.dtype, device=self.device)
+            self.host.append(torch.empty((h, w, 3), dtype=torch.uint8, pin_memory=pin))
+            self.dev.append(torch.empty((h, w, 3), dtype=torch.uint8, device=self.device))
+            self.out.append(out)
+            self.roi.append(out[:, :, top:top + nh, left:left + nw])
+        self.graphs = [None] * self.slots
+        if self.device.type == "cuda":
+            # Capture every slot now rather than on first use, so no capture
+            # ever runs while the detector works on another slot
+            for slot in range(self.slots):
+                self._capture(slot)
+
+    def _letterbox(self, slot):
+        """Device‑side letterbox of ``self.dev[slot]`` into ``self.out[slot]``."""
+        x = self.dev[slot].permute(2, 0, 1).unsqueeze(0).flip(1).to(self.dtype).div_(255)
+        self.roi[slot].copy_(F.interpolate(x, size=self.resized, mode="bilinear", align_corners=False))
+
+    def _capture(self, slot):
+        """Warm up once eagerly, then record the slot's letterbox as a CUDA Graph."""
+        stream = self.streams[slot]
+        with torch.cuda.stream(stream):
+            self._letterbox(slot)
+        stream.synchronize()
+        graph = torch.cuda.CUDAGraph()
+        # thread_local: CUDA calls made by other threads stay legal during capture
+        with torch.cuda.graph(graph, stream=stream, capture_error_mode="thread_local"):
+            self._letterbox(slot)
+        self.graphs[slot] = graph
+
+    def __call__(self, frame, slot: int = 0):
+        """Queue preprocessing of a BGR ``uint8`` frame into ``slot`` and return its tensor.
+
+        The work is asynchronous on the slot's stream; call :meth:`synchronize`
+        before handing the tensor to a consumer on another stream or thread.
+        """
+        if frame.shape != self.frame_shape:
+            self._allocate(frame.shape)
+        stream = self.streams[slot]
+        if stream is not None:
+            # The previous upload from this slot's pinned buffer must be done
+            stream.synchronize()
+        with torch.cuda.stream(stream) if stream is not None else nullcontext():
+            self.host[slot].numpy()[...] = frame
+            self.dev[slot].copy_(self.host[slot], non_blocking=True)
+            if stream is None:
+                self._letterbox(slot)
+            else:
+                self.graphs[slot].replay()
+        return self.out[slot]
+
+    def synchronize(self, slot: int = 0):
+        """Block until the preprocessing queued on ``slot`` has finished."""
+        if self.streams[slot] is not None:
+            self.streams[slot].synchronize()
+
+    def unletterbox(self, xyxy):
+        """Map ``N×4`` boxes from the letterboxed tensor back to frame pixels.
+
+        Boxes reaching into the padding are clipped to the frame, as
+        Ultralytics' ``scale_boxes`` does.
+        """
+        left, top = self.pad
+        h, w = self.frame_shape[:2]
+        offset = xyxy.new_tensor([left, top, left, top])
+        boxes = (xyxy - offset) / self.scale
+        boxes[:, 0::2] = boxes[:, 0::2].clamp(0, w)
+        boxes[:, 1::2] = boxes[:, 1::2].clamp(0, h)
+        return boxes
+
+# --------------------------------------------------------------------------- #
+# 3.  Low‑latency drone I/O                                                   #
+# --------------------------------------------------------------------------- #
+
+class LowLatencyFrameReader:
+    """Decode the Tello H.264 UDP stream with PyAV, keeping only the newest frame.
+
+    Drop‑in for ``drone.get_frame_read()`` (``.frame`` / ``.stop()``) that
+    demuxes with FFmpeg's no‑buffer / low‑delay flags, avoiding the ~1 s of
+    input buffering behind OpenCV's capture path.
+    """
+
+    OPTIONS = {"fflags": "nobuffer", "flags": "low_delay", "probesize": "32"}
+    TIMEOUT = 5.0  # seconds without data before the demuxer gives up
+
+    def __init__(self, address: str = "udp://@0.0.0.0:11111"):
+        self.address = address
+        self.container = self._open()
+        self.stopped = False
+        self._frame = None
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._update, daemon=True)
+        self._thread.start()
+
+    def _open(self):
+        return av.open(self.address, options=self.OPTIONS, timeout=self.TIMEOUT)
+
+    def _update(self):
+        """Background thread: decode packets as they arrive and publish the last frame.
+
+        A corrupt packet (common on lossy UDP) is skipped; if the demuxer
+        itself fails or times out the container is reopened.
+        """
+        try:
+            while not self.stopped:
+                try:
+                    for packet in self.container.demux(video=0):
+                        if self.stopped:
+                            break
+                        try:
+                            video_frames = packet.decode()
+                        except av.error.FFmpegError:
+                            continue
+                        for video_frame in video_frames:
+                            img = video_frame.to_ndarray(format="bgr24")
+                            with self._lock:
+                                self._frame = img
+                except av.error.FFmpegError as e:
+                    if self.stopped:
+                        break
+                    print(f"[video] demuxer failed ({e}), reopening")
+                self.container.close()
+                while not self.stopped:
+                    try:
+                        self.container = self._open()
+                        break
+                    except av.error.FFmpegError:
+                        time.sleep(0.5)
+        finally:
+            self.container.close()
+
+    @property
+    def frame(self):
+        """Most recently decoded BGR frame, or ``None`` before the first one."""
+        with self._lock:
+            return self._frame
+
+    def stop(self):
+        """Stop decoding; the thread exits after the next packet."""
+        self.stopped = True
+        self._thread.join(timeout=1)
+
+
+class TelemetryCache:
+    """Battery and height refreshed at ``hz`` on a daemon thread.
+
+    The overlay reads the cached ints every frame instead of querying the
+    drone from inside the control loop.  A failed query keeps the previous
+    value rather than stalling the render loop.
+
+    Kept in step with ``TelemetryCache`` in the top-level ``main.py``.
+    """
+
+    def __init__(self, drone: Tello, hz: float = 1.0):
+        self.drone = drone
+        self.period = 1 / hz
+        self.battery = 0
+        self.height = 0
+        self._poll()
+        self.stopped = False
+        self._thread = threading.Thread(target=self._update, daemon=True)
+        self._thread.start()
+
+    def _poll(self):
+        """Query the drone once; transient telemetry errors are ignored."""
+        try:
+            self.battery = self.drone.get_battery()
+            self.height = self.drone.get_height()
+        except Exception as exc:
+            print("Telemetry read failed:", exc)
+
+    def _update(self):
+        """Background thread: poll the drone once per period."""
+        while not self.stopped:
+            time.sleep(self.period)
+            self._poll()
+
+    def stop(self):
+        """Stop polling; the thread exits within one period."""
+        self.stopped = True
+
+# --------------------------------------------------------------------------- #
+# 4.  Main flight loop                                                        #
+# --------------------------------------------------------------------------- #
+
+def run_drone(detector: AutoBackend,
               detect_hz: int = 10,
               loop_hz: int = 20,
               speed_xy: int = 50,
@@ -78,26 +345,33 @@ def run_drone(detector: YOLO,
         for i, txt in enumerate(lines):
             cv2.putText(frame, txt, (10, 30 + i * 25), FONT, 0.7, (0, 255, 0), 2, cv2.LINE_AA)
 
-    def overlay_dets(frame, dets, chase_pt=None):
+    def overlay_dets(frame, dets, largest=None, chase_pt=None):
         h, w = frame.shape[:2]
-        largest = person_box
+        # Boxes are grouped by style and drawn with one polylines call each
+        # (at most three) instead of one cv2.rectangle call per detection
+        boxes, labels = {}, []
         for x1, y1, x2, y2, cls, conf in dets:
             if cls == "person":
                 is_largest = largest == (x1, y1, x2, y2)
                 color, thick = ((0, 255, 0), 4) if is_largest else ((0, 0, 255), 4)
             else:
                 color, thick = (0, 255, 255), 2
-            cv2.rectangle(frame, (x1, y1), (x2, y2), color, thick)
-            lbl = f"{cls} {conf:.2f}"
-            cv2.putText(frame, lbl, (x1, max(y1 - 6, 15)), FONT, 0.55, color, 1, cv2.LINE_AA)
-            if cls == "person":
-                x1n, y1n = x1 / w, y1 / h
-                x2n, y2n = x2 / w, y2 / h
-                txt_scale = 0.45
-                cv2.putText(frame, f"TL({x1n:.3f},{y1n:.3f})", (x1, y1 - 20 if y1 - 20 > 15 else y1 + 15), FONT, txt_scale, color, 1, cv2.LINE_AA)
-                cv2.putText(frame, f"TR({x2n:.3f},{y1n:.3f})", (x2 - 140, y1 - 20 if y1 - 20 > 15 else y1 + 15), FONT, txt_scale, color, 1, cv2.LINE_AA)
-                cv2.putText(frame, f"BR({x2n:.3f},{y2n:.3f})", (x2 - 140, y2 + 18), FONT, txt_scale, color, 1, cv2.LINE_AA)
-                cv2.putText(frame, f"BL({x1n:.3f},{y2n:.3f})", (x1, y2 + 18), FONT, txt_scale, color, 1, cv2.LINE_AA)
+            boxes.setdefault((color, thick), []).append(((x1, y1), (x2, y1), (x2, y2), (x1, y2)))
+            labels.append((f"{cls} {conf:.2f}", (x1, max(y1 - 6, 15)), color))
+        for (color, thick), quads in boxes.items():
+            cv2.polylines(frame, np.array(quads, np.int32), True, color, thick)
+        for lbl, org, color in labels:
+            cv2.putText(frame, lbl, org, FONT, 0.55, color, 1, cv2.LINE_AA)
+        # Normalised corner coordinates only matter for the chase target
+        if largest is not None:
+            x1, y1, x2, y2 = largest
+            x1n, y1n, x2n, y2n = x1 / w, y1 / h, x2 / w, y2 / h
+            color, txt_scale = (0, 255, 0), 0.45
+            y_top = y1 - 20 if y1 - 20 > 15 else y1 + 15
+            cv2.putText(frame, f"TL({x1n:.3f},{y1n:.3f})", (x1, y_top), FONT, txt_scale, color, 1, cv2.LINE_AA)
+            cv2.putText(frame, f"TR({x2n:.3f},{y1n:.3f})", (x2 - 140, y_top), FONT, txt_scale, color, 1, cv2.LINE_AA)
+            cv2.putText(frame, f"BR({x2n:.3f},{y2n:.3f})", (x2 - 140, y2 + 18), FONT, txt_scale, color, 1, cv2.LINE_AA)
+            cv2.putText(frame, f"BL({x1n:.3f},{y2n:.3f})", (x1, y2 + 18), FONT, txt_scale, color, 1, cv2.LINE_AA)
         # red chase point
         if chase_pt is not None:
             cx, cy = chase_pt
@@ -107,17 +381,90 @@ def run_drone(detector: YOLO,
     drone = Tello()
     drone.connect()
     drone.streamon()
-    frame_reader = drone.get_frame_read()
-    print("Drone connected:", drone.get_battery(), "% battery")  
+    frame_reader = LowLatencyFrameReader(drone.get_udp_video_address())
+    telemetry = TelemetryCache(drone)
+    print("Drone connected:", telemetry.battery, "% battery")
     drone.takeoff()
 
     # ---------------- Loop state ------------------------------------------
+    preprocess = GpuPreprocessor(detector.imgsz, "cuda" if torch.cuda.is_available() else "cpu")
     fps_times = deque(maxlen=FPS_SMOOTH)
     last_detect = 0.0
     detections = []
+    target_box = None         # largest person among the displayed detections
+
+    # Inference runs on a worker so the GPU works on frame N while this loop
+    # grabs/draws frame N+1; at most one job per preprocessing slot in flight.
+    det_pool = ThreadPoolExecutor(max_workers=1)
+    in_flight = deque()
+    next_slot = 0
+
+    person_id = next(k for k, v in detector.names.items() if v == "person")
+
+    # Detection rows come back through a persistent pinned buffer on a
+    # dedicated copy stream; only the event for that copy is waited on.
+    on_cuda = preprocess.device.type == "cuda"
+    host_rows = torch.empty((300, 7), dtype=torch.float32, pin_memory=on_cuda)
+    copy_stream = torch.cuda.Stream(preprocess.device) if on_cuda else None
+    copy_done = torch.cuda.Event() if on_cuda else None
+
+    def to_host(rows):
+        """Copy an ``N×7`` device tensor into the pinned buffer; return it as NumPy."""
+        nonlocal host_rows
+        if rows.shape[0] > host_rows.shape[0]:
+            host_rows = torch.empty((rows.shape[0], 7), dtype=torch.float32, pin_memory=on_cuda)
+        out = host_rows[:rows.shape[0]]
+        if copy_stream is None:
+            out.copy_(rows)
+            return out.numpy()
+        copy_stream.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(copy_stream):
+            out.copy_(rows, non_blocking=True)
+            copy_done.record()
+        rows.record_stream(copy_stream)
+        copy_done.synchronize()
+        return out.numpy()
+
+    def detect(slot):
+        """Run YOLO on a preprocessed slot; return (detections, largest person box)."""
+        preprocess.synchronize(slot)
+        x = preprocess.out[slot]
+        with torch.inference_mode():
+            pred = detector(x.half() if detector.fp16 else x.float())
+            # Same thresholds as Ultralytics' predict defaults
+            data = ops.non_max_suppression(pred, 0.25, 0.7)[0].float()  # x1 y1 x2 y2 conf cls
+        xyxy = preprocess.unletterbox(data[:, :4]).trunc()
+        # Person areas are computed on the device (-1 for other classes) and
+        # everything crosses to the host in a single contiguous copy
+        areas = ((xyxy[:, 2] - xyxy[:, 0]) * (xyxy[:, 3] - xyxy[:, 1])).masked_fill(data[:, 5] != person_id, -1)
+        rows = to_host(torch.cat([xyxy, data[:, 4:6], areas[:, None]], dim=1))
+        names = detector.names
+        dets = [(int(x1), int(y1), int(x2), int(y2), names[int(cls_id)], float(conf))
+                for x1, y1, x2, y2, conf, cls_id, _ in rows]
+        if not dets:
+            return dets, None
+        idx = int(rows[:, 6].argmax())
+        return dets, (dets[idx][:4] if rows[idx, 6] > 0 else None)
 
     autopilot = False
-    key0_prev = False
+
+    # Key state is maintained by one keyboard hook instead of polling
+    # keyboard.is_pressed() for every key on every iteration.
+    pressed = set()
+
+    def on_key(event):
+        nonlocal autopilot
+        if event.event_type == keyboard.KEY_DOWN:
+            # OS auto-repeat re-sends KEY_DOWN while '0' is held; toggle only
+            # on the up -> down transition
+            if event.name == '0' and '0' not in pressed:
+                autopilot = not autopilot
+                print("AUTOPILOT", "ON" if autopilot else "OFF")
+            pressed.add(event.name)
+        else:
+            pressed.discard(event.name)
+
+    keyboard.hook(on_key)
 
     chase_counter = 0         # frames left until we drop back to search
     last_xmid = 0.5           # last seen x‑ce   ntre (norm)
@@ -127,37 +474,29 @@ def run_drone(detector: YOLO,
         while True:
             t0 = time.perf_counter()
 
-            # ---- 0. Toggle autopilot with key "0" ------------------------
-            key0_curr = keyboard.is_pressed('0')
-            if key0_curr and not key0_prev:
-                autopilot = not autopilot
-                print("AUTOPILOT", "ON" if autopilot else "OFF")
-            key0_prev = key0_curr
-
             # ---- 1. Grab frame -------------------------------------------
             frame = frame_reader.frame
             if frame is None:
                 continue
             fh, fw = frame.shape[:2]
 
-            # ---- 2. Detection (<= detect_hz) -----------------------------
+            # ---- 2. Detection (<= detect_hz, pipelined) ------------------
             now = time.perf_counter()
             person_box = None
-            if now - last_detect >= 1 / detect_hz:
-                results = detector(frame, verbose=False)[0]
-                detections.clear()
-                largest_area = 0
-                for box, cls_id, conf in zip(results.boxes.xyxy.int().tolist(),
-                                             results.boxes.cls.int().tolist(),
-                                             results.boxes.conf.tolist()):
-                    x1, y1, x2, y2 = box
-                    cls_name = detector.names[cls_id]
-                    detections.append((x1, y1, x2, y2, cls_name, conf))
-                    if cls_name == "person":
-                        area = (x2 - x1) * (y2 - y1)
-                        if area > largest_area:
-                            largest_area = area
-                            person_box = (x1, y1, x2, y2)
+            while in_flight and in_flight[0].done():
+                detections, person_box = in_flight.popleft().result()
+                target_box = person_box
+            if now - last_detect >= 1 / detect_hz and len(in_flight) < preprocess.slots:
+                if frame.shape != preprocess.frame_shape:
+                    # A new frame size reallocates the slots and recaptures
+                    # their graphs: let the in-flight jobs finish first
+                    while in_flight:
+                        detections, person_box = in_flight.popleft().result()
+                        target_box = person_box
+                # Always the newest frame, one per job (batch 1)
+                preprocess(frame, next_slot)
+                in_flight.append(det_pool.submit(detect, next_slot))
+                next_slot = (next_slot + 1) % preprocess.slots
                 last_detect = now
 
             # ---- 3. Update chase counter & last seen metrics -------------
@@ -188,10 +527,10 @@ def run_drone(detector: YOLO,
                 yaw_auto, ud_auto, mode = 0, 0, 0
 
             # ---- 5. Manual inputs ---------------------------------------
-            lr = (speed_xy if keyboard.is_pressed('d') else -speed_xy if keyboard.is_pressed('a') else 0)
-            fb = (3 * speed_xy if (keyboard.is_pressed('w') or (autopilot and chase_counter > 0)) else -3 * speed_xy if keyboard.is_pressed('s') else 0)
-            ud_manual = (speed_z if keyboard.is_pressed('i') else -speed_z if keyboard.is_pressed('k') else 0)
-            yaw_manual = (speed_yaw if keyboard.is_pressed('l') else -speed_yaw if keyboard.is_pressed('j') else 0)
+            lr = (speed_xy if 'd' in pressed else -speed_xy if 'a' in pressed else 0)
+            fb = (3 * speed_xy if ('w' in pressed or (autopilot and chase_counter > 0)) else -3 * speed_xy if 's' in pressed else 0)
+            ud_manual = (speed_z if 'i' in pressed else -speed_z if 'k' in pressed else 0)
+            yaw_manual = (speed_yaw if 'l' in pressed else -speed_yaw if 'j' in pressed else 0)
 
             ud_cmd = max(-100, min(100, ud_manual + ud_auto))
             yaw_cmd = max(-100, min(100, yaw_manual + yaw_auto))
@@ -200,24 +539,27 @@ def run_drone(detector: YOLO,
 
             # ---- 6. UI & frame display -----------------------------------
             chase_pt_px = (last_xmid * fw, last_ytop * fh) if autopilot and chase_counter > 0 else None
-            overlay_dets(frame, detections, chase_pt_px)
+            overlay_dets(frame, detections, target_box, chase_pt_px)
             fps_times.append(now)
             fps = ((len(fps_times) - 1) / (fps_times[-1] - fps_times[0]) if len(fps_times) > 1 else 0.0)
-            overlay_telemetry(frame, drone.get_battery(), drone.get_height(), fps, mode, chase_counter)
+            overlay_telemetry(frame, telemetry.battery, telemetry.height, fps, mode, chase_counter)
 
             cv2.imshow("Tello FPV + YOLO", frame)
-            if cv2.waitKey(1) & 0xFF == 27 or keyboard.is_pressed('space'):
+            if cv2.waitKey(1) & 0xFF == 27 or 'space' in pressed:
                 break
 
             # ---- 7. Maintain loop timing ----------------------------------
             time.sleep(max(0, (1 / loop_hz) - (time.perf_counter() - t0)))
 
     finally:
+        keyboard.unhook_all()
+        det_pool.shutdown(wait=True, cancel_futures=True)
         try:
             drone.send_rc_control(0, 0, 0, 0)
             drone.land()
         except Exception:
             pass
+        telemetry.stop()
         frame_reader.stop()
         drone.streamoff()
         drone.end()
@@ -6,6 +6,8 @@ import time
 import os
 os.environ["OPENCV_VIDEOIO_MSMF_ENABLE_HW_TRANSFORMS"] = "0"
 # Disable hardware transforms for Media Foundation backend
+os.environ.setdefault("OPENCV_FFMPEG_CAPTURE_OPTIONS", "fflags;nobuffer|flags;low_delay")
+# Ask the FFmpeg demuxer not to buffer input, so frames are not delivered late
 
 class CameraStream:
     """Simple threaded wrapper around cv2.VideoCapture."""
@@ -13,34 +15,56 @@ class CameraStream:
     def __init__(self, stream_url: str):
         """Start grabbing frames from the given URL."""
         self.cap = cv2.VideoCapture(stream_url, cv2.CAP_FFMPEG)
-        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 3)
+        # Keep at most one queued frame; update() keeps grabbing, so the frame
+        # retrieved by read() is always the newest one
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
         if not self.cap.isOpened():
             raise Exception("Cannot open stream. Check the URL and your network connection.")
         self.latest_frame = None
+        self.wanted = False  # read() is waiting for the next grabbed frame
         self.running = True
         self.lock = threading.Lock()
+        self.frame_ready = threading.Condition(self.lock)
         self.thread = threading.Thread(target=self.update, daemon=True)
         time.sleep(2)  # Allow some time for the camera to warm up
         self.thread.start()
     
     def update(self):
-        """Background thread that continuously reads frames."""
+        """Background thread that continuously grabs (but does not decode to BGR) frames.
+
+        Only this thread touches ``cap``, so the blocking grab runs without the
+        lock; a frame is retrieved only when read() has asked for one.
+        """
         while self.running:
-            time.sleep(0.1)
-            if not self.cap.grab():
-                # Grab failed, skip this iteration
+            grabbed = self.cap.grab()
+            # The first frame is retrieved unasked so a non-blocking read()
+            # has something to return
+            if grabbed and (self.wanted or self.latest_frame is None):
+                ret, frame = self.cap.retrieve()
+                if not ret:
+                    print("Failed to retrieve frame.")
+                with self.frame_ready:
+                    if ret:
+                        self.latest_frame = frame
+                    self.wanted = False
+                    self.frame_ready.notify_all()
+            if not grabbed:
+                # Grab failed, back off briefly instead of spinning
                 print("Failed to grab frame.")
-                continue
-            ret, frame = self.cap.retrieve()
-            if not ret:
-                print("Failed to retrieve frame.")
-                continue
-            with self.lock:
-                self.latest_frame = frame
+                time.sleep(0.01)
+
+    def read(self, timeout: float = 0.0):
+        """Return the most recent frame (thread-safe).
 
-    def read(self):
-        """Return the most recent frame (thread-safe)."""
-        with self.lock:
+        Asks the capture thread to retrieve the frame it grabs next.  By default
+        this does not block and returns the last retrieved frame; pass
+        *timeout* > 0 to wait up to that many seconds for the fresh one.  Only
+        frames that are asked for are converted to BGR, so the others skip the
+        colour conversion entirely.
+        """
+        with self.frame_ready:
+            self.wanted = True
+            self.frame_ready.wait_for(lambda: not self.wanted, timeout)
             return self.latest_frame.copy() if self.latest_frame is not None else None
 
     def stop(self):
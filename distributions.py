@@ -24,17 +24,12 @@ def detect_high_intensity_regions(distribution, channel_name):
     threshold = np.mean(distribution) + 3.5 * np.std(distribution)
     high_intensity_mask = distribution > 10000  # Adjust this threshold as needed
 
-    # Find continuous regions of high intensity
-    regions = []
-    start = None
-    for i, is_high in enumerate(high_intensity_mask):
-        if is_high and start is None:
-            start = i
-        elif not is_high and start is not None:
-            regions.append((start, i - 1))
-            start = None
-    if start is not None:  # Handle case where region extends to the end
-        regions.append((start, len(distribution) - 1))
+    # Find continuous regions of high intensity: +1/-1 steps of the padded
+    # mask mark where each run starts and where the one after it ends
+    edges = np.diff(np.concatenate(([0], high_intensity_mask.view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+    regions = list(zip(starts.tolist(), ends.tolist()))
 
     print(f"{channel_name} Channel High-Intensity Regions: {regions}")
 
@@ -78,9 +73,9 @@ if __name__ == "__main__":
         image_path = os.path.join("output/images", image_file)
 
         edge_image = cv2.imread(image_path)
-        red_distribution = np.sum(edge_image[:, :, 2], axis=0)  # Red channel
-        green_distribution = np.sum(edge_image[:, :, 1], axis=0)  # Green channel
-        blue_distribution = np.sum(edge_image[:, :, 0], axis=0)  # Blue channel
+        # One pass over the image for all three column sums, shape (W, 3)
+        sums = edge_image.sum(axis=0, dtype=np.int32)
+        blue_distribution, green_distribution, red_distribution = sums[:, 0], sums[:, 1], sums[:, 2]
 
         blue_regions = detect_high_intensity_regions(blue_distribution, "Blue")
         green_regions = detect_high_intensity_regions(green_distribution, "Green")
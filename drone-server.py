@@ -1,9 +1,19 @@
 """Minimal Flask server to stream frames from a DJI Tello."""
 
 from flask import Flask, Response
+import time
 import cv2
 from djitellopy import Tello
 
+try:
+    # libjpeg-turbo (SIMD) encoder; optional, falls back to OpenCV below
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    turbo_jpeg = TurboJPEG()
+except (ImportError, RuntimeError, OSError):
+    turbo_jpeg = None
+
+JPEG_QUALITY = 80
+
 app = Flask(__name__)
 
 # Open the default camera (0), or replace with your IP camera URL
@@ -19,20 +29,33 @@ print("Drone connected:", drone.get_battery(), "% battery")
 #drone.streamoff()
 #drone.end()
 
+def encode_jpeg(frame):
+    """Encode a BGR frame to JPEG bytes, with libjpeg-turbo when available."""
+    if turbo_jpeg is not None:
+        return turbo_jpeg.encode(frame, quality=JPEG_QUALITY, pixel_format=TJPF_BGR)
+    ret, buffer = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), JPEG_QUALITY])
+    return buffer.tobytes()
+
 def generate_frames():
     """Generator yielding JPEG frames from the drone."""
+    last_frame = None
     while True:
         # Uncomment the following line to stream from a regular webcam instead
         # success, frame = camera.read()
         success, frame = True, frame_reader.frame
         if not success:
             break
+        # The reader hands out a new array per decoded frame; don't re-encode
+        # (or re-send) the same one
+        if frame is last_frame:
+            time.sleep(0.005)
+            continue
+        last_frame = frame
         # Encode frame as JPEG
-        ret, buffer = cv2.imencode('.jpg', frame)
-        frame = buffer.tobytes()
+        frame_bytes = encode_jpeg(frame)
         # Yield frame in HTTP multipart format
         yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
+               b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
 
 @app.route('/video_feed')
 def video_feed():
@@ -49,4 +72,11 @@ def do_something():
     return f"Function called! Result: {result}"
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5001)
+    # Every MJPEG client holds a worker for as long as it streams, so serve
+    # requests concurrently: waitress when installed, else threaded Flask
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(host='0.0.0.0', port=5001, threaded=True)
+    else:
+        serve(app, host='0.0.0.0', port=5001, threads=8)
@@ -32,18 +32,39 @@ Overlays (each frame)
 Dependencies
 ------------
     pip install djitellopy ultralytics opencv-python keyboard torch
+    pip install tensorrt   # optional: FP16 engine instead of PyTorch on CUDA
 """
 
 from collections import deque
+from pathlib import Path
+import asyncio
+import json
 import time
 import cv2
 import keyboard
 import torch
+import torch.nn.functional as F
 import threading
 import numpy as np
+from numba import njit
+from torchvision.io import encode_jpeg as tv_encode_jpeg
 from ultralytics import YOLO
+from ultralytics.utils import ops
 from djitellopy import Tello
-from flask import Flask, Response
+from aiohttp import web
+
+try:
+    # TensorRT runtime for exported engines; optional, PyTorch is used without it
+    import tensorrt as trt
+except ImportError:
+    trt = None
+
+try:
+    # libjpeg-turbo (SIMD) encoder; optional, falls back to OpenCV below
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+    turbo_jpeg = TurboJPEG()
+except (ImportError, RuntimeError, OSError):
+    turbo_jpeg = None
 
 # Global drone instance and takeoff flag shared between threads
 drone = None
@@ -51,73 +72,424 @@ takeoff_event = threading.Event()
 from autopilot import Autopilot, OffState, SearchState, TrackState
 
 # --------------------------------------------------------------------------- #
-# Flask web server setup. This exposes a simple endpoint for streaming the
-# drone's camera feed to a browser.  Frames are supplied by the main drone loop
-# using a shared memory buffer protected by a lock.
+# aiohttp web server setup. This exposes a simple endpoint for streaming the
+# drone's camera feed to a browser.  The camera thread encodes each frame once
+# and publishes the JPEG bytes into a single-slot channel that every stream
+# client awaits on the event loop.
 # --------------------------------------------------------------------------- #
 
-app = Flask(__name__)
-
-stream_frame_lock = threading.Lock()
-stream_shared_frame = {"frame": None}
+class LatestFrame:
+    """Single-slot frame channel from the drone threads to the event loop.
 
-def generate_frames():
-    """Yield encoded JPEG frames for the web stream."""
-    while True:
-        # Obtain the latest frame in a thread-safe manner
-        with stream_frame_lock:
-            frame = stream_shared_frame["frame"]
+    ``publish`` overwrites the slot (older frames are dropped, never queued)
+    and wakes every waiting client, so slow clients only ever see the newest
+    frame and never hold back the camera thread.  ``viewers`` counts the
+    connected clients so the publisher can skip encoding when nobody watches.
+    """
 
-        if frame is None:
-            # If no frame is available yet, send a blank image so the client
-            # keeps receiving data and the connection stays open.
-            black = (255 * np.zeros((480, 640, 3), dtype=np.uint8))
-            ret, buffer = cv2.imencode('.jpg', black)
-            time.sleep(0.2)
-        else:
-            # Encode the frame read from the drone
-            ret, buffer = cv2.imencode('.jpg', frame)
-
-        frame_bytes = buffer.tobytes()
-        # Multipart response required by HTML5 video streaming via MJPEG
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-
-@app.route('/video_feed')
-def video_feed():
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frame = None
+        self._seq = 0
+        self._loop = None
+        self._changed = None
+        self.viewers = 0
+
+    def bind(self, loop):
+        """Attach to the event loop whose coroutines wait for new frames."""
+        self._loop = loop
+        self._changed = asyncio.Event()
+
+    def publish(self, frame):
+        """Store *frame* as the newest one (callable from any thread)."""
+        with self._lock:
+            self._frame = frame
+            self._seq += 1
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._notify)
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def next(self, seq, timeout):
+        """Wait up to *timeout* s for a frame newer than *seq*; return ``(seq, frame)``."""
+        changed = self._changed
+        with self._lock:
+            if self._seq != seq:
+                return self._seq, self._frame
+        try:
+            await asyncio.wait_for(changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        with self._lock:
+            return self._seq, self._frame
+
+stream_frames = LatestFrame()
+
+# The MJPEG preview does not need more than this; OpenCV defaults to 95
+JPEG_QUALITY = 72
+
+# nvJPEG (through torchvision) is used while it works; the first failure
+# switches the stream over to the CPU encoders.
+nvjpeg_enabled = torch.cuda.is_available()
+jpeg_local = threading.local()
+
+def encode_jpeg_cuda(frame):
+    """Encode a BGR frame with nvJPEG using this thread's pinned buffer and stream."""
+    if getattr(jpeg_local, "host", None) is None or jpeg_local.host.shape != frame.shape:
+        jpeg_local.host = torch.empty(frame.shape, dtype=torch.uint8, pin_memory=True)
+        jpeg_local.stream = torch.cuda.Stream()
+    jpeg_local.host.numpy()[...] = frame
+    with torch.cuda.stream(jpeg_local.stream):
+        # HWC BGR -> CHW RGB on the device, then encode there
+        image = jpeg_local.host.to("cuda", non_blocking=True).permute(2, 0, 1).flip(0).contiguous()
+        encoded = tv_encode_jpeg(image, quality=JPEG_QUALITY)
+        return encoded.cpu().numpy().tobytes()
+
+def encode_jpeg(frame):
+    """Encode a BGR frame to JPEG bytes, on the GPU when possible.
+
+    Falls back to libjpeg-turbo when available, then to OpenCV.
+    """
+    global nvjpeg_enabled
+    if nvjpeg_enabled:
+        try:
+            return encode_jpeg_cuda(frame)
+        except (RuntimeError, TypeError) as exc:
+            print("nvJPEG encoding unavailable, falling back to the CPU:", exc)
+            nvjpeg_enabled = False
+    if turbo_jpeg is not None:
+        return turbo_jpeg.encode(frame, quality=JPEG_QUALITY, pixel_format=TJPF_BGR,
+                                 jpeg_subsample=TJSAMP_420)
+    ret, buffer = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), JPEG_QUALITY,
+                                               int(cv2.IMWRITE_JPEG_OPTIMIZE), 0])
+    return buffer.tobytes()
+
+# Black placeholder sent until the first camera frame arrives, encoded once
+_BLANK_JPEG = cv2.imencode('.jpg', np.zeros((480, 640, 3), dtype=np.uint8))[1].tobytes()
+
+async def video_feed(request):
     """HTTP endpoint returning the MJPEG video stream."""
-    return Response(
-        generate_frames(),
-        mimetype='multipart/x-mixed-replace; boundary=frame'
+    response = web.StreamResponse(
+        headers={"Content-Type": "multipart/x-mixed-replace; boundary=frame"}
     )
+    await response.prepare(request)
+    stream_frames.viewers += 1
+    seq = 0
+    try:
+        while True:
+            # Wait (without blocking the event loop) for a newer frame; the
+            # camera thread has already encoded it, every client sends the
+            # same bytes
+            new_seq, frame_bytes = await stream_frames.next(seq, timeout=0.2)
+            if frame_bytes is None:
+                # If no frame is available yet, send a blank image so the client
+                # keeps receiving data and the connection stays open.
+                frame_bytes = _BLANK_JPEG
+            elif new_seq == seq:
+                continue
+            seq = new_seq
+
+            # Multipart response required by HTML5 video streaming via MJPEG
+            await response.write(b'--frame\r\n'
+                                 b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+    except ConnectionResetError:
+        pass  # client went away
+    finally:
+        stream_frames.viewers -= 1
+    return response
 
-@app.route('/do', methods=['POST'])
-def do_something():
+async def do_something(request):
     """Trigger drone takeoff via HTTP."""
     takeoff_event.set()
-    return "Takeoff command sent"
+    return web.Response(text="Takeoff command sent")
+
+async def bind_stream(app):
+    """Hand the running event loop to the frame channel on startup."""
+    stream_frames.bind(asyncio.get_running_loop())
+
+app = web.Application()
+app.router.add_get('/video_feed', video_feed)
+app.router.add_post('/do', do_something)
+app.on_startup.append(bind_stream)
 
 # --------------------------------------------------------------------------- #
 # 1.  Model‑loader                                                            #
 # --------------------------------------------------------------------------- #
 
-def load_detector(model_path: str = "yolov8n.pt", imgsz: int = 416, prefer_gpu: bool = True) -> YOLO:
-    """Load a YOLOv8 model and move it to the appropriate device."""
+class GraphedDetector:
+    """YOLOv8 forward pass replayed from a CUDA Graph at a fixed input size.
+
+    Frames are letterboxed into a static ``1×3×imgsz×imgsz`` input tensor, the
+    captured graph is replayed, and NMS plus box rescaling run eagerly on the
+    captured output.  On CPU the network is simply called directly.  The input
+    follows the network's dtype, so a half-precision model gets FP16 frames.
+
+    On CUDA the raw ``uint8`` frame is uploaded once from a pinned buffer and
+    letterboxed on the device; only the CPU path resizes with OpenCV.
+    """
+
+    def __init__(self, model: YOLO, imgsz: int = 416, conf: float = 0.25, iou: float = 0.7, warmup: int = 3):
+        self.net = model.model
+        self.names = model.names
+        param = next(self.net.parameters())
+        self.device, self.dtype = param.device, param.dtype
+        self.imgsz = imgsz
+        self.conf, self.iou = conf, iou
+        # Static input/output tensors the graph reads from and writes to
+        self.input = torch.zeros((1, 3, imgsz, imgsz), device=self.device, dtype=self.dtype)
+        self.graph = None
+        self.frame_shape = None
+        with torch.inference_mode():
+            if self.device.type == "cuda":
+                # Warm up on a side stream (cuDNN autotuning, allocations),
+                # then record one forward pass
+                side = torch.cuda.Stream()
+                side.wait_stream(torch.cuda.current_stream())
+                with torch.cuda.stream(side):
+                    for _ in range(warmup):
+                        self.net(self.input)
+                torch.cuda.current_stream().wait_stream(side)
+                self.graph = torch.cuda.CUDAGraph()
+                with torch.cuda.graph(self.graph):
+                    self.output = self.forward()
+            else:
+                # Same warm-up on CPU so the first real frame is not the slow one
+                for _ in range(warmup):
+                    self.forward()
+
+    def forward(self):
+        """Raw head output (``1×(4+nc)×N``) for the current static input."""
+        pred = self.net(self.input)
+        return pred[0] if isinstance(pred, (list, tuple)) else pred
+
+    def _allocate(self, frame_shape):
+        """(Re)allocate the upload buffers and letterbox region for a frame size."""
+        h, w = frame_shape[:2]
+        scale = min(self.imgsz / h, self.imgsz / w)
+        nh, nw = round(h * scale), round(w * scale)
+        top, left = (self.imgsz - nh) // 2, (self.imgsz - nw) // 2
+        self.frame_shape = frame_shape
+        self.resized = (nh, nw)
+        self.host = torch.empty((h, w, 3), dtype=torch.uint8, pin_memory=True)
+        self.dev = torch.empty((h, w, 3), dtype=torch.uint8, device=self.device)
+        # Padding is constant, so only the resized region is rewritten per frame
+        self.input.fill_(114 / 255)
+        self.roi = self.input[:, :, top:top + nh, left:left + nw]
+
+    def preprocess(self, frame):
+        """Letterbox a BGR frame into the static input tensor (RGB, CHW, 0..1)."""
+        if self.device.type == "cuda":
+            if frame.shape != self.frame_shape:
+                self._allocate(frame.shape)
+            # The previous upload has finished: its detections were already
+            # copied back to the host before this call
+            self.host.numpy()[...] = frame
+            self.dev.copy_(self.host, non_blocking=True)
+            x = self.dev.permute(2, 0, 1).unsqueeze(0).flip(1).to(self.dtype).div_(255)
+            self.roi.copy_(F.interpolate(x, size=self.resized, mode="bilinear", align_corners=False))
+            return
+
+        h, w = frame.shape[:2]
+        scale = min(self.imgsz / h, self.imgsz / w)
+        nh, nw = round(h * scale), round(w * scale)
+        top, left = (self.imgsz - nh) // 2, (self.imgsz - nw) // 2
+        canvas = np.full((self.imgsz, self.imgsz, 3), 114, dtype=np.uint8)
+        canvas[top:top + nh, left:left + nw] = cv2.resize(frame, (nw, nh), interpolation=cv2.INTER_LINEAR)
+        chw = torch.from_numpy(np.ascontiguousarray(canvas[:, :, ::-1].transpose(2, 0, 1)))
+        self.input.copy_(chw.unsqueeze(0)).div_(255)
+
+    def __call__(self, frame):
+        """Detect objects in a BGR frame; return ``N×6`` (x1, y1, x2, y2, conf, cls)."""
+        with torch.inference_mode():
+            self.preprocess(frame)
+            if self.graph is not None:
+                self.graph.replay()
+                pred = self.output
+            else:
+                pred = self.forward()
+            det = ops.non_max_suppression(pred, self.conf, self.iou)[0]
+            det = det.float()
+            det[:, :4] = ops.scale_boxes(self.input.shape[2:], det[:, :4], frame.shape)
+        return det
+
+class TRTDetector(GraphedDetector):
+    """YOLOv8 TensorRT engine run directly through ``tensorrt.Runtime``.
+
+    The engine reads from and writes to static CUDA tensors, so letterboxing,
+    NMS and box rescaling are shared with :class:`GraphedDetector`; only the
+    forward pass is replaced by ``execute_async_v3`` on the current stream.
+    """
+
+    def __init__(self, engine_path: str, warmup: int = 3, conf: float = 0.25, iou: float = 0.7):
+        logger = trt.Logger(trt.Logger.WARNING)
+        with open(engine_path, "rb") as f, trt.Runtime(logger) as runtime:
+            # Ultralytics prefixes the engine with a length-prefixed JSON header
+            meta_len = int.from_bytes(f.read(4), byteorder="little")
+            metadata = json.loads(f.read(meta_len).decode("utf-8"))
+            self.engine = runtime.deserialize_cuda_engine(f.read())
+        self.context = self.engine.create_execution_context()
+        self.names = {int(k): v for k, v in metadata["names"].items()}
+        self.device = torch.device("cuda")
+        self.conf, self.iou = conf, iou
+        self.graph = None
+        self.frame_shape = None
+
+        # One device tensor per engine I/O, bound once by address
+        buffers = {}
+        for i in range(self.engine.num_io_tensors):
+            name = self.engine.get_tensor_name(i)
+            dtype = torch.float16 if self.engine.get_tensor_dtype(name) == trt.DataType.HALF else torch.float32
+            buffers[name] = torch.zeros(tuple(self.engine.get_tensor_shape(name)), device=self.device, dtype=dtype)
+            self.context.set_tensor_address(name, buffers[name].data_ptr())
+            if self.engine.get_tensor_mode(name) == trt.TensorIOMode.INPUT:
+                self.input = buffers[name]
+            else:
+                self.output = buffers[name]
+        self.dtype = self.input.dtype
+        self.imgsz = self.input.shape[2]
+
+        for _ in range(warmup):
+            self.forward()
+
+    def forward(self):
+        """Run the engine on the static input; return the static output tensor."""
+        self.context.execute_async_v3(torch.cuda.current_stream().cuda_stream)
+        return self.output
+
+def export_engine(model_path: str = "yolov8n.pt", imgsz: int = 416) -> str:
+    """Export *model_path* once to a static FP16 TensorRT engine and return its path."""
+    engine_path = Path(model_path).with_suffix(".engine")
+    if not engine_path.exists():
+        YOLO(model_path).export(format="engine", half=True, imgsz=imgsz, dynamic=False, device=0)
+    return str(engine_path)
+
+def load_detector(model_path: str = "yolov8n.pt", imgsz: int = 416, prefer_gpu: bool = True) -> GraphedDetector:
+    """Load a YOLOv8 model, move it to the appropriate device and capture it.
+
+    On CUDA with TensorRT installed the weights are exported to an FP16 engine
+    on first use and run through :class:`TRTDetector`; ``.engine`` paths are
+    loaded as-is.
+    """
+    use_gpu = prefer_gpu and torch.cuda.is_available()
+    if use_gpu and trt is not None:
+        if model_path.endswith(".pt"):
+            model_path = export_engine(model_path, imgsz)
+        return TRTDetector(model_path)
+
     # Load the model weights from disk
     model = YOLO(model_path)
 
     # Select GPU if available and requested, otherwise fall back to CPU
-    model.to("cuda" if prefer_gpu and torch.cuda.is_available() else "cpu")
+    model.to("cuda" if use_gpu else "cpu")
+    if use_gpu:
+        # The input shape never changes, so let cuDNN autotune once for it
+        torch.backends.cudnn.benchmark = True
     # Fuse model layers for slightly faster inference
     model.fuse()
-    # Set the default inference resolution
-    model.imgsz = imgsz
-    return model
+    model.model.eval()
+    if use_gpu:
+        # FP16 roughly halves latency and VRAM on the GPU; CPU stays FP32
+        model.model.half()
+    # Fixed inference resolution, so the forward pass can be graph-captured
+    return GraphedDetector(model, imgsz)
+
+@njit(cache=True)
+def pick_largest_person(xyxy, cls_ids, person_id):
+    """Return ``(index, area)`` of the largest box of class ``person_id``.
+
+    ``area`` is 0 (and ``index`` -1) when there is no person.
+    """
+    best, best_area = -1, 0
+    for i in range(xyxy.shape[0]):
+        if cls_ids[i] == person_id:
+            area = (xyxy[i, 2] - xyxy[i, 0]) * (xyxy[i, 3] - xyxy[i, 1])
+            if area > best_area:
+                best, best_area = i, area
+    return best, best_area
 
 # --------------------------------------------------------------------------- #
 # 2.  Main flight loop                                                        #
 # --------------------------------------------------------------------------- #
 
+# Telemetry overlay: header per autopilot mode and the fixed baseline of each line
+_MODE_LABELS = ("AUTO OFF", "SEARCHING…", "KILL MODE (%d)", "TRACK MODE")
+_HELP_LINE = "HELP W/S A/D I/K J/L 0=AUTO SPACE=LAND"
+_TELEMETRY_Y = tuple(30 + i * 25 for i in range(5))
+
+class TelemetryCache:
+    """Battery and height refreshed at ``hz`` on a daemon thread.
+
+    The overlay reads the cached ints every frame instead of querying the
+    drone from inside the camera thread.  A failed query keeps the previous
+    value rather than stalling the render loop.
+
+    Kept in step with ``TelemetryCache`` in ``WebApplication/main.py``.
+    """
+
+    def __init__(self, drone: Tello, hz: float = 1.0):
+        self.drone = drone
+        self.period = 1 / hz
+        self.battery = 0
+        self.height = 0
+        self._poll()
+        self.stopped = False
+        self._thread = threading.Thread(target=self._update, daemon=True)
+        self._thread.start()
+
+    def _poll(self):
+        """Query the drone once; transient telemetry errors are ignored."""
+        try:
+            self.battery = self.drone.get_battery()
+            self.height = self.drone.get_height()
+        except Exception as exc:
+            print("Telemetry read failed:", exc)
+
+    def _update(self):
+        """Background thread: poll the drone once per period."""
+        while not self.stopped:
+            time.sleep(self.period)
+            self._poll()
+
+    def stop(self):
+        """Stop polling; the thread exits within one period."""
+        self.stopped = True
+
+class KeyState:
+    """Keyboard state maintained by ``keyboard`` press/release callbacks.
+
+    The control loop only reads plain attributes instead of polling
+    ``keyboard.is_pressed`` for every key on every iteration.  Axis keys set
+    ``lr``/``fb``/``ud``/``yaw`` while held; ``mode``, ``takeoff`` and ``quit``
+    latch on press until the loop consumes them.
+    """
+
+    MODE_KEYS = {'1': (OffState, "OFF"), '0': (SearchState, "SEARCH"), '2': (TrackState, "TRACK")}
+
+    def __init__(self, speed_xy: int, speed_z: int, speed_yaw: int):
+        self.lr = self.fb = self.ud = self.yaw = 0
+        self.mode = None
+        self.takeoff = False
+        self.quit = False
+        axes = {'d': ('lr', speed_xy), 'a': ('lr', -speed_xy),
+                'w': ('fb', speed_xy), 's': ('fb', -5 * speed_xy),
+                'i': ('ud', speed_z), 'k': ('ud', -speed_z),
+                'l': ('yaw', speed_yaw), 'j': ('yaw', -speed_yaw)}
+        for key, (axis, value) in axes.items():
+            keyboard.on_press_key(key, lambda _e, a=axis, v=value: setattr(self, a, v))
+            keyboard.on_release_key(key, lambda _e, a=axis, v=value: self._release(a, v))
+        for key, mode in self.MODE_KEYS.items():
+            keyboard.on_press_key(key, lambda _e, m=mode: setattr(self, 'mode', m))
+        keyboard.on_press_key('5', lambda _e: setattr(self, 'takeoff', True))
+        for key in ('space', 'esc'):
+            keyboard.on_press_key(key, lambda _e: setattr(self, 'quit', True))
+
+    def _release(self, axis, value):
+        # Only clear the axis if the opposite key has not taken it over since
+        if getattr(self, axis) == value:
+            setattr(self, axis, 0)
+
 
 def run_drone(
               detect_hz: int = 10,
@@ -137,18 +509,23 @@ def run_drone(
     # ---------------- Overlay helpers -------------------------------------
     def overlay_telemetry(frame, batt, alt, fps, mode, counter):
         """Draw basic telemetry and helper text on the frame."""
-        header = {0: "AUTO OFF", 1: "SEARCHING…", 2: f"KILL MODE ({counter})", 3: "TRACK MODE"}[mode]
-        lines = [header,
-                 f"BAT  {batt:>3}%",
-                 f"ALT  {alt:>3} cm",
-                 f"FPS  {fps:>4.1f}",
-                 "HELP W/S A/D I/K J/L 0=AUTO SPACE=LAND"]
-        for i, txt in enumerate(lines):
-            cv2.putText(frame, txt, (10, 30 + i * 25), FONT, 0.7, (0, 255, 0), 2, cv2.LINE_AA)
-
-    def overlay_dets(frame, dets, chase_pt=None):
-        """Render detection results and optional chase point."""
+        header = _MODE_LABELS[mode] % counter if mode == 2 else _MODE_LABELS[mode]
+        lines = (header,
+                 "BAT  %3d%%" % batt,
+                 "ALT  %3d cm" % alt,
+                 "FPS  %4.1f" % fps,
+                 _HELP_LINE)
+        for txt, y in zip(lines, _TELEMETRY_Y):
+            cv2.putText(frame, txt, (10, y), FONT, 0.7, (0, 255, 0), 2, cv2.LINE_AA)
+
+    def overlay_dets(frame, dets, chase_pt=None, corners=False):
+        """Render detection results and optional chase point.
+
+        Normalised corner coordinates are guidance debug output and are only
+        drawn on person boxes when ``corners`` is set (track mode).
+        """
         h, w = frame.shape[:2]
+        inv_w, inv_h = 1.0 / w, 1.0 / h
         largest = detection_result.get("person_box")
         for x1, y1, x2, y2, cls, conf in dets:
             if cls == "person":
@@ -157,16 +534,15 @@ def run_drone(
             else:
                 color, thick = (0, 255, 255), 2
             cv2.rectangle(frame, (x1, y1), (x2, y2), color, thick)
-            lbl = f"{cls} {conf:.2f}"
-            cv2.putText(frame, lbl, (x1, max(y1 - 6, 15)), FONT, 0.55, color, 1, cv2.LINE_AA)
-            if cls == "person":
-                x1n, y1n = x1 / w, y1 / h
-                x2n, y2n = x2 / w, y2 / h
-                txt_scale = 0.45
-                cv2.putText(frame, f"TL({x1n:.3f},{y1n:.3f})", (x1, y1 - 20 if y1 - 20 > 15 else y1 + 15), FONT, txt_scale, color, 1, cv2.LINE_AA)
-                cv2.putText(frame, f"TR({x2n:.3f},{y1n:.3f})", (x2 - 140, y1 - 20 if y1 - 20 > 15 else y1 + 15), FONT, txt_scale, color, 1, cv2.LINE_AA)
-                cv2.putText(frame, f"BR({x2n:.3f},{y2n:.3f})", (x2 - 140, y2 + 18), FONT, txt_scale, color, 1, cv2.LINE_AA)
-                cv2.putText(frame, f"BL({x1n:.3f},{y2n:.3f})", (x1, y2 + 18), FONT, txt_scale, color, 1, cv2.LINE_AA)
+            cv2.putText(frame, "%s %.2f" % (cls, conf), (x1, max(y1 - 6, 15)), FONT, 0.55, color, 1, cv2.LINE_8)
+            if corners and cls == "person":
+                x1n, y1n, x2n, y2n = x1 * inv_w, y1 * inv_h, x2 * inv_w, y2 * inv_h
+                y_top = y1 - 20 if y1 - 20 > 15 else y1 + 15
+                for txt, org in (("TL(%.3f,%.3f)" % (x1n, y1n), (x1, y_top)),
+                                 ("TR(%.3f,%.3f)" % (x2n, y1n), (x2 - 140, y_top)),
+                                 ("BR(%.3f,%.3f)" % (x2n, y2n), (x2 - 140, y2 + 18)),
+                                 ("BL(%.3f,%.3f)" % (x1n, y2n), (x1, y2 + 18))):
+                    cv2.putText(frame, txt, org, FONT, 0.45, color, 1, cv2.LINE_8)
         # Draw the red guidance point that autopilot aims for
         if chase_pt is not None:
             cx, cy = chase_pt
@@ -179,7 +555,14 @@ def run_drone(
     drone.connect()
     drone.streamon()
     frame_reader = drone.get_frame_read()
-    print("Drone connected:", drone.get_battery(), "% battery")
+    telemetry = TelemetryCache(drone)
+    print("Drone connected:", telemetry.battery, "% battery")
+
+    # Load and warm up the detector before any thread needs it, so the first
+    # real frame does not pay for weight loading and cuDNN autotuning
+    print("Loading detector...")
+    detector = load_detector("yolov8n.pt")
+    print("Detector loaded.")
 
     # ---------------- Loop state ------------------------------------------
     fps_times = deque(maxlen=FPS_SMOOTH)
@@ -189,53 +572,73 @@ def run_drone(
     detection_result = {"boxes": [], "person_box": None}
     frame_lock = threading.Lock()
     shared_frame = {"frame": None}
+    frame_available = threading.Event()  # set by the camera thread per new frame
 
     autopilot = Autopilot(speed_xy, speed_z, speed_yaw)
+    keys = KeyState(speed_xy, speed_z, speed_yaw)
     key0_prev = False
 
     mode=0
     # --- Detection thread function ---
-    def detection_thread_func():
+    def detection_thread_func(detector):
         """Run YOLO detection asynchronously from the camera thread."""
-        print("Loading detector in detection thread...")
-        detector = load_detector("yolov8n.pt")
-        print("Detector loaded.")
+        person_id = next(k for k, v in detector.names.items() if v == "person")
+        last_run = 0.0
         while not stop_event.is_set():
+            # Sleep until the camera thread has a new frame, so the same frame
+            # is never run through the detector twice
+            if not frame_available.wait(timeout=0.5):
+                continue
+            # Cap at detect_hz: wait out the rest of the interval, then take
+            # whichever frame is newest at that point
+            remaining = 1 / detect_hz - (time.monotonic() - last_run)
+            if remaining > 0 and stop_event.wait(remaining):
+                break
+            frame_available.clear()
             with frame_lock:
                 frame = shared_frame["frame"]
+            last_run = time.monotonic()
             if frame is not None:
                 # print(frame.shape, "frame received in detection thread")
-                results = detector(frame, verbose=False)[0]
-                dets = []
-                person_box = None
-                largest_area = 0
-                for box, cls_id, conf in zip(results.boxes.xyxy.int().tolist(),
-                                             results.boxes.cls.int().tolist(),
-                                             results.boxes.conf.tolist()):
-                    x1, y1, x2, y2 = box
-                    cls_name = detector.names[cls_id]
-                    dets.append((x1, y1, x2, y2, cls_name, conf))
-                    if cls_name == "person":
-                        area = (x2 - x1) * (y2 - y1)
-                        if area > largest_area:
-                            largest_area = area
-                            person_box = (x1, y1, x2, y2)
+                det = detector(frame).cpu().numpy()
+                xyxy = det[:, :4].astype(np.int32)
+                cls_ids = det[:, 5].astype(np.int32)
+                idx, area = pick_largest_person(xyxy, cls_ids, person_id)
+                person_box = tuple(xyxy[idx].tolist()) if area > 0 else None
+                # Plain tuples are only built for the render thread
+                dets = [(x1, y1, x2, y2, detector.names[cls_id], conf)
+                        for (x1, y1, x2, y2), cls_id, conf in zip(xyxy.tolist(),
+                                                                  cls_ids.tolist(),
+                                                                  det[:, 4].tolist())]
                 with detection_lock:
                     detection_result["boxes"] = dets
                     detection_result["person_box"] = person_box
-            time.sleep(1 / detect_hz)
 
     # --- Camera thread function ---
     def camera_thread_func():
         """Grab frames from the drone and draw overlays."""
         nonlocal detections
+        # Overlays are drawn into a reused buffer that is encoded right away
+        canvas = None
+        last_frame = None
         while not stop_event.is_set():
             frame = frame_reader.frame
+            if frame is last_frame:
+                # No new decode since the last tick
+                time.sleep(1/loop_hz)
+                continue
+            last_frame = frame
+            # The reader hands out a fresh array per decode and nothing draws
+            # on it, so the detector can share it without a copy
             with frame_lock:
-                shared_frame["frame"] = frame.copy() if frame is not None else None
+                shared_frame["frame"] = frame
+            frame_available.set()
 
             # --- Overlay detection results and telemetry ---
             if frame is not None:
+                if canvas is None or canvas.shape != frame.shape:
+                    canvas = np.empty_like(frame)
+                np.copyto(canvas, frame)
                 with detection_lock:
                     dets = list(detection_result["boxes"])
                 # Use shared variables from outer scope
@@ -243,20 +646,21 @@ def run_drone(
                     autopilot.last_xmid * frame.shape[1],
                     autopilot.last_ytop * frame.shape[0]
                 ) if autopilot.chase_counter > 0 else None
-                overlay_dets(frame, dets, chase_pt_px)
+                overlay_dets(canvas, dets, chase_pt_px, corners=autopilot.mode == 3)
                 fps_times.append(time.perf_counter())
                 fps = (
                     (len(fps_times) - 1) / (fps_times[-1] - fps_times[0])
                     if len(fps_times) > 1 else 0.0
                 )
-                overlay_telemetry(frame, drone.get_battery(), drone.get_height(), fps, autopilot.mode, autopilot.chase_counter)
+                overlay_telemetry(canvas, telemetry.battery, telemetry.height, fps, autopilot.mode, autopilot.chase_counter)
 
-                with stream_frame_lock:
-                    stream_shared_frame["frame"] = frame.copy()
+                # Encode once here and share the bytes with every client
+                if stream_frames.viewers:
+                    stream_frames.publish(encode_jpeg(canvas))
             time.sleep(1/loop_hz)  # throttle the loop to avoid overloading the drone
 
     stop_event = threading.Event()
-    det_thread = threading.Thread(target=detection_thread_func,daemon=False)
+    det_thread = threading.Thread(target=detection_thread_func, args=(detector,), daemon=False)
     cam_thread = threading.Thread(target=camera_thread_func,daemon=False)
     det_thread.start()
     cam_thread.start()
@@ -265,7 +669,7 @@ def run_drone(
     frame = None
     while frame is None:
         with frame_lock:
-            frame = shared_frame["frame"].copy() if shared_frame["frame"] is not None else None
+            frame = shared_frame["frame"]
         if frame is None:
             time.sleep(1/loop_hz)  # wait for a frame to be available
     fh, fw = frame.shape[:2]
@@ -292,15 +696,11 @@ def run_drone(
             #    1 -> manual control
             #    0 -> search mode
             #    2 -> tracking mode
-            if keyboard.is_pressed('1'):
-                autopilot.set_state(OffState())
-                print("AUTOPILOT OFF")
-            elif keyboard.is_pressed('0'):
-                autopilot.set_state(SearchState())
-                print("AUTOPILOT SEARCH")
-            elif keyboard.is_pressed('2'):
-                autopilot.set_state(TrackState())
-                print("AUTOPILOT TRACK")
+            mode, keys.mode = keys.mode, None
+            if mode is not None:
+                state, label = mode
+                autopilot.set_state(state())
+                print("AUTOPILOT", label)
 
             # ---- 2. Get detection results from detection thread ------------
             # Pull the most recent person bounding box from the shared result
@@ -314,10 +714,7 @@ def run_drone(
             # ---- 4. Autopilot commands -----------------------------------
             yaw_auto, ud_auto, fb_auto, _ = autopilot.update()
 
-            lr = (speed_xy if keyboard.is_pressed('d') else -speed_xy if keyboard.is_pressed('a') else 0)
-            fb = (speed_xy if (keyboard.is_pressed('w')) else -5*speed_xy if keyboard.is_pressed('s') else 0)
-            ud_manual = (speed_z if keyboard.is_pressed('i') else -speed_z if keyboard.is_pressed('k') else 0)
-            yaw_manual = (speed_yaw if keyboard.is_pressed('l') else -speed_yaw if keyboard.is_pressed('j') else 0)
+            lr, fb, ud_manual, yaw_manual = keys.lr, keys.fb, keys.ud, keys.yaw
 
             #ud_cmd = max(-100, min(100, ud_manual + ud_auto))
             #yaw_cmd = max(-100, min(100, yaw_manual + yaw_auto))
@@ -342,9 +739,10 @@ def run_drone(
                 drone.send_rc_control(int(lr), int(fb), int(ud), int(yaw))
                 time.sleep(1/loop_hz)  # throttle the loop to avoid overloading the drone
             else:
-                if keyboard.is_pressed('5') or takeoff_event.is_set():
+                if keys.takeoff or takeoff_event.is_set():
                     drone.takeoff()
                     flying = True
+                    keys.takeoff = False
                     takeoff_event.clear()
                     print("Drone is now flying.")
                 else:
@@ -354,10 +752,10 @@ def run_drone(
                     print("fb_auto:", fb_auto, "ud_auto:", ud_auto, "yaw_auto:", yaw_auto)
                     print("lr:", lr, "fb:", fb, "ud:", ud, "yaw:", yaw)
                     time.sleep(4)  # wait for takeoff command
-                    if(keyboard.is_pressed('space') or keyboard.is_pressed('esc')):
+                    if keys.quit:
                         break
 
-            if cv2.waitKey(1) & 0xFF == 27 or keyboard.is_pressed('space'):
+            if cv2.waitKey(1) & 0xFF == 27 or keys.quit:
                 break
 
             # ---- 7. Maintain loop timing ----------------------------------
@@ -365,6 +763,8 @@ def run_drone(
 
     finally:
         # Cleanly shut down worker threads and the drone
+        keyboard.unhook_all()
+        telemetry.stop()
         stop_event.set()
         det_thread.join(timeout=1)
         cam_thread.join(timeout=1)
@@ -387,10 +787,10 @@ if __name__ == "__main__":
     #if not torch.cuda.is_available():
         #raise RuntimeError("CUDA GPU is not available! Please run on a machine with a supported GPU.")
 
-    # Launch the main drone loop in its own thread so the Flask server can
+    # Launch the main drone loop in its own thread so the web server can
     # continue serving frames concurrently
     drone_thread = threading.Thread(target=run_drone, daemon=False)
     drone_thread.start()
 
-    # Start the Flask web server on the main thread
-    app.run(host='0.0.0.0', port=5001)
+    # Start the aiohttp web server on the main thread
+    web.run_app(app, host='0.0.0.0', port=5001)
@@ -2,6 +2,7 @@ import cv2
 import os
 import depth_estimation
 import rect_predict
+import distributions
 import numpy as np
 
 def test_images(image_folder):
@@ -29,6 +30,68 @@ def test_images(image_folder):
 
         print(f"Image {image_file} processed successfully.")
 
+def reference_edges_with_rgb(image):
+    """The original OpenCV edge map: three filter2D passes + NORM_MINMAX."""
+    right_kernel = np.array([[-1, 0, 1],
+                             [-2, 0, 2],
+                             [-1, 0, 1]])
+    top_kernel = np.array([[-1, -2, -1],
+                           [0, 0, 0],
+                           [1, 2, 1]])
+    gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    channels = [cv2.normalize(cv2.filter2D(gray_image, -1, kernel), None, 0, 255, cv2.NORM_MINMAX)
+                for kernel in (-right_kernel, right_kernel, top_kernel)]
+    return np.dstack(channels)
+
+def test_edge_kernel(image_folder):
+    """The fused Numba edge kernel must match the OpenCV reference exactly."""
+    images = {image_file: cv2.imread(os.path.join(image_folder, image_file))
+              for image_file in os.listdir(image_folder)}
+    rng = np.random.default_rng(0)
+    # Small frames exercise the reflect-101 borders, a flat one the
+    # zero-range channel branch of the normalisation
+    images["small"] = rng.integers(0, 256, (4, 5, 3), dtype=np.uint8)
+    images["flat"] = np.full((20, 30, 3), 7, dtype=np.uint8)
+    for name, image in images.items():
+        expected = reference_edges_with_rgb(image)
+        actual = rect_predict.detect_edges_with_rgb(image)
+        assert np.array_equal(actual, expected), f"Edge kernel differs from OpenCV for {name}"
+    print("Edge kernel matches the OpenCV reference.")
+
+def reference_consecutive_pairs(blue_regions, green_regions):
+    """The original two-pointer walk behind find_consecutive_pairs."""
+    pairs = []
+    i, j = 0, 0
+    while i < len(blue_regions) and j < len(green_regions):
+        blue_start, blue_end = blue_regions[i]
+        green_start, green_end = green_regions[j]
+        if blue_end < green_start:
+            if j == 0 or green_regions[j - 1][1] < blue_start:
+                if i + 1 >= len(blue_regions) or blue_regions[i + 1][0] > green_end:
+                    pairs.append(((blue_start, blue_end), (green_start, green_end)))
+            i += 1
+        else:
+            j += 1
+    return pairs
+
+def test_consecutive_pairs(cases=5000):
+    """The vectorised pairing must match the two-pointer walk on random layouts."""
+    rng = np.random.default_rng(0)
+
+    def random_regions(width):
+        # Runs of a random column mask, as detect_high_intensity_regions finds them
+        mask = rng.random(width) < rng.random()
+        edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+        return list(zip(np.flatnonzero(edges == 1).tolist(), (np.flatnonzero(edges == -1) - 1).tolist()))
+
+    for _ in range(cases):
+        width = int(rng.integers(1, 60))
+        blue_regions, green_regions = random_regions(width), random_regions(width)
+        expected = reference_consecutive_pairs(blue_regions, green_regions)
+        actual = distributions.find_consecutive_pairs(blue_regions, green_regions)
+        assert actual == expected, f"Pairing differs for {blue_regions} / {green_regions}"
+    print("Region pairing matches the two-pointer reference.")
+
 def test_videos(video_folder):
     for video_file in os.listdir(video_folder):
         video_path = os.path.join(video_folder, video_file)
@@ -49,5 +112,7 @@ def test_videos(video_folder):
         print(f"Video {video_file} processed successfully.")
 
 if __name__ == "__main__":
+    test_edge_kernel("test_data/images")
+    test_consecutive_pairs()
     test_images("test_data/images")
     test_videos("test_data/videos")
\ No newline at end of file